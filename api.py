@@ -3,7 +3,9 @@
 api.py - GameTrack backend
 
 Run:
-    python api.py
+    python api.py [--port 5000] [--debug]   (dev server; --debug or FLASK_DEBUG=1 enables debug mode)
+    gunicorn -w 4 -k gthread --threads 8 api:app   (production)
+    gunicorn -k gevent -w $(nproc) --worker-connections 200 wsgi:app   (production, async workers; see wsgi.py)
 
 This file provides the Flask app and all API endpoints used by the frontend:
  - /api/teams
@@ -15,67 +17,265 @@ This file provides the Flask app and all API endpoints used by the frontend:
  - /api/team/<team_id>/schedule
  - /api/player/<player_id>/profile
  - /api/player/<player_id>/gamelog
- - /api/game/<game_id>/boxscore
+ - /api/game/<game_id>/boxscore   (?format=msgpack for a binary body when msgpack is installed)
+ - /api/player/<player_id>/accolades
+ - /api/players/accolades?ids=<id>,<id>,...   (batch, up to 100 ids; at most 5 uncached names looked up per call)
 
 Notes:
  - If nba_api calls fail, endpoints return safe sample data so UI remains functional.
+ - If orjson is installed (pip install orjson), it is used for all JSON responses.
+ - If flask-compress is installed (pip install flask-compress), JSON responses are compressed.
+ - If msgpack is installed (pip install msgpack), boxscores can be requested as msgpack.
+ - The CDN league schedule is kept in ~/.cache/gametrack (or $XDG_CACHE_HOME) and revalidated by ETag,
+   so restarts avoid re-downloading it.
 """
 import os
 import time
 import json
 import logging
 import re
+import functools
+import importlib
+import heapq
+import threading
+import hashlib
+import tempfile
+from stat import S_ISDIR
+import gzip
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone # <-- ADDED TIMEZONE
-from flask import Flask, jsonify, render_template, send_from_directory
+from flask import Flask, jsonify, render_template, send_from_directory, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import pandas as pd
 import requests # <-- ADDED REQUESTS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Try importing nba_api modules; if not available, endpoints will fall back.
+# Only the small static teams table is imported here. nba_api.stats.endpoints pulls in every
+# endpoint module (~0.3s), so it is deferred to the first request that needs one (see _ep).
 try:
     from nba_api.stats.static import teams as teams_static
-    from nba_api.stats.endpoints import (
-        # scoreboardv2, <-- REMOVED
-        leaguestandingsv3,
-        leaguedashplayerstats,
-        commonteamroster,
-        commonplayerinfo,
-        playergamelog,
-        # teamgamelog, <-- REMOVED
-        boxscoretraditionalv3,
-        boxscoreadvancedv3
-    )
+    from nba_api.stats.static import players as players_static
     NBA_API_AVAILABLE = True
 except Exception:
     NBA_API_AVAILABLE = False
 
+@functools.lru_cache(maxsize=None)
+def _ep(name):
+    # e.g. _ep('leaguestandingsv3').LeagueStandingsV3(...); used: leaguestandingsv3, leaguedashplayerstats,
+    # commonteamroster, commonplayerinfo, playergamelog (boxscores and scoreboard come from the CDN)
+    return importlib.import_module(f'nba_api.stats.endpoints.{name}')
+
+# orjson is optional; when installed it replaces the stdlib json encoder for every jsonify() call.
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# flask-compress is optional; when installed, JSON responses are gzip/br encoded for clients that accept it.
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+# msgpack is optional; when installed, /api/game/<game_id>/boxscore?format=msgpack returns a binary body.
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (C encoder, handles numpy scalars natively)."""
+    def _dumpb(self, obj, indent=False, sort_keys=None):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._dumpb(obj, indent=kwargs.get('indent'), sort_keys=kwargs.get('sort_keys')).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # jsonify() ends up here: hand orjson's bytes straight to the response
+        # instead of decoding to str and letting Werkzeug re-encode it.
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumpb(obj, indent=indent), mimetype=self.mimetype)
+
 app = Flask(__name__, static_folder="static", template_folder="templates")
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)
+if COMPRESS_AVAILABLE:
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_LEVEL'] = 4 # balance CPU vs ratio
+    app.config['COMPRESS_MIN_SIZE'] = 1024 # tiny bodies (errors, accolades) aren't worth a compressor pass
+    Compress(app)
 app.config['JSON_SORT_KEYS'] = False
+app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+# Flask >= 2.3 ignores the two config keys above; set the same options on the provider.
+app.json.compact = True
+app.json.sort_keys = False
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
 # Config
 CURRENT_SEASON = "2025-26"
 STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 ACCOLADES_FILE = os.path.join(STATIC_DIR, "accolades_active.json")
+# Raw CDN schedule + its ETag, persisted so a restarted worker revalidates instead of re-downloading.
+# Kept in a private (0700) per-user cache dir, never the shared system temp dir.
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), "gametrack")
+SCHEDULE_CACHE_FILE = os.path.join(CACHE_DIR, "schedule_v2.json")
+# Shared HTTP session for the NBA CDN: keep-alive reuses TCP/TLS connections across requests,
+# and transient 5xx responses are retried with a short backoff.
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                                    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])))
+_HTTP.headers.update({'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'GameTrack/1.0'})
+
+LOGO_URL_TEMPLATE = "https://cdn.nba.com/logos/nba/{}/global/L/logo.svg"
+# There are only 30 team ids, so build their logo URLs once instead of per team per request.
+LOGO_URLS = {t['id']: LOGO_URL_TEMPLATE.format(t['id']) for t in teams_static.get_teams()} if NBA_API_AVAILABLE else {}
+
+# Simple in-memory cache: a bounded LRU plus a min-heap of expiry times, so expired
+# entries are swept proactively instead of lingering until the same key is read again.
+CACHE_MAX_ENTRIES = 1024
+_CACHE = OrderedDict()
+_CACHE_EXPIRY_HEAP = [] # (expiry, key); may hold stale pairs for overwritten/evicted keys
+_CACHE_LOCK = threading.Lock()
+
+class _CacheEntry:
+    __slots__ = ('expiry', 'val')
+    def __init__(self, expiry, val):
+        self.expiry = expiry
+        self.val = val
 
-# Simple in-memory cache
-_CACHE = {}
 def cache_get(key):
-    v = _CACHE.get(key)
-    if not v:
-        return None
-    expiry, val = v
-    if time.time() > expiry:
-        if key in _CACHE: # Check if key exists before deleting
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            return None
+        if time.time() > entry.expiry:
             del _CACHE[key]
-        return None
-    return val
+            return None
+        _CACHE.move_to_end(key)
+        return entry.val
 
 def cache_set(key, val, ttl=30):
-    _CACHE[key] = (time.time() + ttl, val)
+    expiry = time.time() + ttl
+    with _CACHE_LOCK:
+        _CACHE[key] = _CacheEntry(expiry, val)
+        _CACHE.move_to_end(key)
+        heapq.heappush(_CACHE_EXPIRY_HEAP, (expiry, key))
+        while len(_CACHE) > CACHE_MAX_ENTRIES:
+            _CACHE.popitem(last=False) # evict least recently used
+        if len(_CACHE_EXPIRY_HEAP) > 2 * CACHE_MAX_ENTRIES:
+            # Evicted and overwritten keys leave stale pairs behind; rebuild from the live entries
+            # (amortized O(1) per set) so the heap stays bounded like the cache itself.
+            _CACHE_EXPIRY_HEAP[:] = [(entry.expiry, k) for k, entry in _CACHE.items()]
+            heapq.heapify(_CACHE_EXPIRY_HEAP)
+
+def cache_sweep():
+    # Pops only the expired heap head, so each sweep is O(k log n) for k expired entries.
+    now = time.time()
+    with _CACHE_LOCK:
+        while _CACHE_EXPIRY_HEAP and _CACHE_EXPIRY_HEAP[0][0] <= now:
+            expiry, key = heapq.heappop(_CACHE_EXPIRY_HEAP)
+            entry = _CACHE.get(key)
+            if entry is not None and entry.expiry == expiry: # skip pairs superseded by a later cache_set
+                del _CACHE[key]
+
+@app.before_request
+def _sweep_cache():
+    cache_sweep()
+
+# Request coalescing: on a cache miss only the first request calls the upstream producer;
+# concurrent requests for the same key wait for it instead of all hitting the NBA servers.
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def fetch_or_wait(key, producer, ttl=30, timeout=30):
+    val = cache_get(key)
+    if val is not None:
+        return val
+    with _INFLIGHT_LOCK:
+        event = _INFLIGHT.get(key)
+        leader = event is None
+        if leader:
+            event = _INFLIGHT[key] = threading.Event()
+    if not leader:
+        event.wait(timeout)
+        val = cache_get(key)
+        if val is None:
+            # Leader failed or is still running; let the caller fall back instead of piling on.
+            raise RuntimeError(f"upstream fetch for {key!r} did not complete")
+        return val
+    try:
+        val = producer()
+        cache_set(key, val, ttl=ttl)
+        return val
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        event.set()
+
+# Background refresh: serve the cached value past its TTL while one pooled worker re-fetches it,
+# so only a cold cache ever makes a request wait on the upstream download.
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='gametrack-refresh')
+
+def fetch_stale_while_revalidate(key, producer, ttl, max_stale):
+    entry = cache_get(key) # (fresh_until, val), kept for max_stale seconds
+    if entry is None:
+        entry = fetch_or_wait(key, lambda: (time.time() + ttl, producer()), ttl=max_stale)
+    elif time.time() > entry[0]:
+        _refresh_in_background(key, producer, ttl, max_stale)
+    return entry[1]
+
+def _refresh_in_background(key, producer, ttl, max_stale):
+    with _INFLIGHT_LOCK:
+        if key in _INFLIGHT:
+            return # a refresh (or cold fetch) is already running
+        event = _INFLIGHT[key] = threading.Event()
+    def refresh():
+        try:
+            cache_set(key, (time.time() + ttl, producer()), ttl=max_stale)
+        except Exception:
+            app.logger.exception("background refresh of %r failed; keeping stale copy", key)
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(key, None)
+            event.set()
+    _POOL.submit(refresh)
 
 # Helpers
+def json_body(payload):
+    # Serialize once and fingerprint the bytes; caching the (body, etag) pair lets repeat hits skip encoding
+    body = jsonify(payload).get_data()
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def etag_response(body, etag, max_age):
+    # Polling clients that send a matching If-None-Match get an empty 304 instead of the full body.
+    # The ETag is weak so it still validates after flask-compress re-encodes the body.
+    resp = app.response_class(body, mimetype='application/json')
+    resp.set_etag(etag, weak=True)
+    resp.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return resp.make_conditional(request)
+
+def team_logo_url(tid):
+    if not tid:
+        return "/static/logo.png"
+    return LOGO_URLS.get(tid) or LOGO_URL_TEMPLATE.format(tid)
+
 def safe_records_from_df(df):
     if df is None:
         return []
@@ -83,35 +283,108 @@ def safe_records_from_df(df):
         return df
     if len(df) == 0:
         return []
-    df = df.copy()
-    
-    # --- *** FIX for ValueError: Columns must be same length as key *** ---
-    # Use a loop-based fillna which is more robust than the
-    # vectorized assignment that was causing the error.
-    numeric_cols = df.select_dtypes(include='number').columns
-    for col in numeric_cols:
-        df[col] = df[col].fillna(0)
-    
-    object_cols = df.select_dtypes(include='object').columns
-    for col in object_cols:
-        df[col] = df[col].fillna("")
-    # --- *** END FIX *** ---
-    
-    for c in df.columns:
-        if pd.api.types.is_datetime64_any_dtype(df[c]):
-            df[c] = df[c].apply(lambda v: v.isoformat() if not pd.isna(v) else None)
-    df = df.loc[:, ~df.columns.duplicated()]
+    if df.columns.has_duplicates:
+        df = df.loc[:, ~df.columns.duplicated()]
+    datetime_cols = df.select_dtypes(include=['datetime', 'datetimetz']).columns
+    has_na = df.isna().values.any()
+    if not has_na and datetime_cols.empty:
+        # Clean frame (the common case): nothing to fill or format.
+        return df.to_dict(orient='records')
+
+    if has_na:
+        # One fillna with a per-column mapping instead of copy() + a fill per dtype group; it
+        # returns a new frame, so the caller's DataFrame is never mutated. Duplicate column labels
+        # (the old "Columns must be same length as key" ValueError) are dropped above.
+        fills = {c: 0 for c in df.select_dtypes(include='number').columns}
+        fills.update({c: "" for c in df.select_dtypes(include='object').columns})
+        df = df.fillna(fills)
+
+    if not datetime_cols.empty:
+        # Vectorized ISO formatting; NaT becomes None (astype(object) keeps it from turning into NaN)
+        df = df.assign(**{c: df[c].dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object).where(df[c].notna(), None)
+                          for c in datetime_cols})
     return df.to_dict(orient='records')
 
-def load_accolades():
-    if os.path.exists(ACCOLADES_FILE):
-        try:
-            with open(ACCOLADES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            app.logger.warning("Failed to load accolades file.")
-            return {}
-    return {}
+@functools.lru_cache(maxsize=1)
+def _teams_enriched():
+    # Static team list with logoUrl attached, built once. Copies, so nba_api's own list is never mutated.
+    if not NBA_API_AVAILABLE:
+        return []
+    return [{**t, 'logoUrl': team_logo_url(t['id'])} for t in teams_static.get_teams()]
+
+@functools.lru_cache(maxsize=1)
+def _teams_by_id():
+    # Static team metadata never changes while the process runs; index it once.
+    # A dict lookup is far cheaper than pd.merge for attaching team info to a few rows.
+    if not NBA_API_AVAILABLE:
+        return {}
+    return {t['id']: t for t in teams_static.get_teams()}
+
+@functools.lru_cache(maxsize=1)
+def _player_names_by_id():
+    # nba_api ships a static id -> name table for every player; index it once so name lookups
+    # only need CommonPlayerInfo (a network call) for players missing from it.
+    if not NBA_API_AVAILABLE:
+        return {}
+    return {p['id']: p['full_name'] for p in players_static.get_players()}
+
+@functools.lru_cache(maxsize=8)
+def _standings_colmap(cols):
+    # Map raw leaguestandingsv3 column names to the names the frontend expects.
+    # Keyed by the column tuple, so a schema change simply produces a new cache entry.
+    colmap = {}
+    for c in cols:
+        lc = c.lower()
+        # Highest-priority rule first; the first match wins.
+        if 'gamesback' in lc or lc == 'gb': colmap[c] = 'GamesBack'
+        elif 'conferencerank' in lc or 'conference_rank' in lc: colmap[c] = 'ConferenceRank'
+        elif lc == 'loss' or lc == 'losses': colmap[c] = 'LOSSES'
+        elif lc == 'win' or lc == 'wins': colmap[c] = 'WINS'
+        elif lc == 'conference': colmap[c] = 'Conference'
+        elif 'team' in lc:
+            if 'name' in lc: colmap[c] = 'TeamName'
+            elif 'tri' in lc or 'abbr' in lc: colmap[c] = 'TeamTricode'
+            elif 'id' in lc: colmap[c] = 'TeamID'
+    return colmap
+
+@functools.lru_cache(maxsize=4)
+def _load_accolades_cached(mtime_ns):
+    # mtime_ns is only the cache key: editing the file changes it and forces a re-read.
+    with open(ACCOLADES_FILE, 'r', encoding='utf-8') as f:
+        accolades = json.load(f)
+    # The file is keyed by player name, with numeric player ids allowed too; split the keys once
+    # so lookups by int player_id need no str() cast per request.
+    by_id = {int(k): v for k, v in accolades.items() if k.isdigit()}
+    by_name = {k: v for k, v in accolades.items() if not k.isdigit()}
+    return by_id, by_name
+
+def load_accolades_index():
+    # (mtime_ns, by_id, by_name); (None, {}, {}) when the file is missing or unreadable.
+    # The only place the file is stat'ed and load errors are reported; pass the result on.
+    try:
+        mtime_ns = os.stat(ACCOLADES_FILE).st_mtime_ns
+        return (mtime_ns, *_load_accolades_cached(mtime_ns))
+    except FileNotFoundError:
+        return None, {}, {}
+    except Exception:
+        app.logger.warning("Failed to load accolades file.")
+        return None, {}, {}
+
+@functools.lru_cache(maxsize=4)
+def _accolades_bodies_cached(mtime_ns):
+    # Finished {"accolades": [...]} responses as (body, etag), per id and per name, so hits skip encoding
+    by_id, by_name = _load_accolades_cached(mtime_ns)
+    return ({k: json_body({"accolades": v}) for k, v in by_id.items()},
+            {k: json_body({"accolades": v}) for k, v in by_name.items()})
+
+def accolades_bodies(index):
+    # (bodies_by_id, bodies_by_name) for an index returned by load_accolades_index()
+    mtime_ns = index[0]
+    return _accolades_bodies_cached(mtime_ns) if mtime_ns is not None else ({}, {})
+
+@functools.lru_cache(maxsize=1)
+def _no_accolades_body():
+    return json_body({"accolades": []})
 
 # Routes: templates
 @app.route('/')
@@ -135,38 +408,27 @@ def static_files(filename):
 # ---------------------------
 # API: /api/teams
 # ---------------------------
+@functools.lru_cache(maxsize=1)
+def _teams_json():
+    all_teams = _teams_enriched()
+    if not all_teams:
+        # fallback sample teams
+        all_teams = [
+            {"id":1610612747,"full_name":"Los Angeles Lakers","abbreviation":"LAL","logoUrl":"/static/logo.png"},
+            {"id":1610612744,"full_name":"Golden State Warriors","abbreviation":"GSW","logoUrl":"/static/logo.png"}
+        ]
+    return json_body(all_teams)
+
 @app.route('/api/teams')
 def api_teams():
-    cached = cache_get('teams')
-    if cached:
-        return jsonify(cached)
     try:
-        if NBA_API_AVAILABLE:
-            all_teams = teams_static.get_teams()
-        else:
-            all_teams = []
-        # ensure each team has id and logoUrl
-        for t in all_teams:
-            tid = t.get('id') or t.get('teamId') or t.get('TEAM_ID')
-            if tid:
-                t['logoUrl'] = f"https://cdn.nba.com/logos/nba/{tid}/global/L/logo.svg"
-            else:
-                t['logoUrl'] = "/static/logo.png"
-        if not all_teams:
-            # fallback sample teams
-            all_teams = [
-                {"id":1610612747,"full_name":"Los Angeles Lakers","abbreviation":"LAL","logoUrl":"/static/logo.png"},
-                {"id":1610612744,"full_name":"Golden State Warriors","abbreviation":"GSW","logoUrl":"/static/logo.png"}
-            ]
-        cache_set('teams', all_teams, ttl=3600)
-        return jsonify(all_teams)
+        return etag_response(*_teams_json(), max_age=3600)
     except Exception as e:
         app.logger.exception("api_teams failed")
         sample = [
             {"id":1610612747,"full_name":"Los Angeles Lakers","abbreviation":"LAL","logoUrl":"/static/logo.png"},
             {"id":1610612744,"full_name":"Golden State Warriors","abbreviation":"GSW","logoUrl":"/static/logo.png"}
         ]
-        cache_set('teams', sample, ttl=3600)
         return jsonify(sample)
 
 # ---------------------------
@@ -174,37 +436,29 @@ def api_teams():
 # ---------------------------
 @app.route('/api/standings')
 def api_standings():
-    cached = cache_get('standings')
-    if cached:
-        return jsonify(cached)
     try:
         if NBA_API_AVAILABLE:
-            s = leaguestandingsv3.LeagueStandingsV3(season=CURRENT_SEASON)
-            df = s.get_data_frames()[0]
-            # normalize column names
-            df = df.rename(columns={c: c if isinstance(c,str) else str(c) for c in df.columns})
-            colmap = {}
-            for c in df.columns:
-                lc = c.lower()
-                if 'team' in lc and 'id' in lc: colmap[c] = 'TeamID'
-                if 'team' in lc and ('tricode' in lc or 'tri' in lc or 'abbr' in lc): colmap[c] = 'TeamTricode'
-                if 'team' in lc and ('name' in lc): colmap[c] = 'TeamName'
-                if lc == 'conference': colmap[c] = 'Conference'
-                if 'win' == lc or lc == 'wins': colmap[c] = 'WINS'
-                if 'loss' == lc or lc == 'losses': colmap[c] = 'LOSSES'
-                if 'conferencerank' in lc or 'conference_rank' in lc: colmap[c] = 'ConferenceRank'
-                if 'gamesback' in lc or 'gb' == lc: colmap[c] = 'GamesBack'
-            if colmap:
-                df = df.rename(columns=colmap)
-            if 'Conference' in df.columns:
-                east = df[df['Conference'].astype(str).str.lower() == 'east']
-                west = df[df['Conference'].astype(str).str.lower() == 'west']
-            else:
-                east = df[df.apply(lambda r: 'east' in str(r.values).lower(), axis=1)]
-                west = df[df.apply(lambda r: 'west' in str(r.values).lower(), axis=1)]
-            out = {"east": safe_records_from_df(east), "west": safe_records_from_df(west)}
-            cache_set('standings', out, ttl=30)
-            return jsonify(out)
+            def fetch_standings():
+                s = _ep('leaguestandingsv3').LeagueStandingsV3(season=CURRENT_SEASON)
+                df = s.get_data_frames()[0]
+                # normalize column names
+                df = df.rename(columns={c: c if isinstance(c,str) else str(c) for c in df.columns})
+                colmap = _standings_colmap(tuple(df.columns))
+                if colmap:
+                    df = df.rename(columns=colmap)
+                if 'Conference' in df.columns:
+                    conf = df['Conference'].astype(str).str.lower() # lowercased once for both masks
+                    east = df[conf == 'east']
+                    west = df[conf == 'west']
+                else:
+                    # No conference column: search each row's text once (vectorized, no per-row apply)
+                    cells = df.astype(str)
+                    text = cells.iloc[:, 0].str.cat(cells.iloc[:, 1:], sep=' ', na_rep='').str.lower()
+                    east = df[text.str.contains('east', regex=False)]
+                    west = df[text.str.contains('west', regex=False)]
+                return {"east": safe_records_from_df(east), "west": safe_records_from_df(west)}
+            body, etag = fetch_or_wait('standings', lambda: json_body(fetch_standings()), ttl=30)
+            return etag_response(body, etag, max_age=30)
         else:
             raise RuntimeError("nba_api not available")
     except Exception as e:
@@ -219,60 +473,59 @@ def api_standings():
                 {"TeamName":"Denver Nuggets","WINS":44,"LOSSES":28,"GamesBack":4}
             ]
         }
-        cache_set('standings', sample, ttl=30)
-        return jsonify(sample)
+        # Cached in the same (body, etag) shape the success path reads back under this key
+        body, etag = json_body(sample)
+        cache_set('standings', (body, etag), ttl=30)
+        return etag_response(body, etag, max_age=30)
 
 # ---------------------------
 # API: /api/games/scoreboard
 # ---------------------------
+def _format_cdn_game(g):
+    # One scoreboard game from CDN; team objects and ids are looked up once each
+    home_team = g.get('homeTeam', {})
+    away_team = g.get('awayTeam', {})
+    home_id = home_team.get('teamId')
+    away_id = away_team.get('teamId')
+    return {
+        "gameId": g.get('gameId'), # This is the nba_api compatible ID
+        "gameStatus": g.get('gameStatusText'),
+        "homeTeamId": home_id,
+        "awayTeamId": away_id,
+        "homeTeam": home_team.get('teamCity') + " " + home_team.get('teamName'),
+        "awayTeam": away_team.get('teamCity') + " " + away_team.get('teamName'),
+        "homeAbbr": home_team.get('teamTricode'),
+        "awayAbbr": away_team.get('teamTricode'),
+        "homeLogo": team_logo_url(home_id),
+        "awayLogo": team_logo_url(away_id),
+        "homeScore": home_team.get('score'),
+        "awayScore": away_team.get('score'),
+        "startTimeUTC": g.get('gameEt', '1970-01-01T00:00:00Z'),
+        "arena": g.get('arena', {}).get('name', '')
+    }
+
 @app.route('/api/games/scoreboard')
 def api_scoreboard():
     """
     FIXED: Replaced scoreboardv2 with a direct call to NBA CDN.
     This is more reliable and faster.
     """
-    cached = cache_get('scoreboard')
-    if cached:
-        return jsonify(cached)
     try:
-        # Fetch directly from the NBA's CDN
-        url = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
-        res = requests.get(url, timeout=5)
-        res.raise_for_status() # Fail fast if the URL is down
-        data = res.json().get('scoreboard', {})
+        def fetch_scoreboard():
+            # Fetch directly from the NBA's CDN
+            url = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+            res = _HTTP.get(url, timeout=5)
+            res.raise_for_status() # Fail fast if the URL is down
+            data = res.json().get('scoreboard', {})
         
-        cdn_games = data.get('games', [])
-        unified = []
-        
-        for g in cdn_games:
             # Transform the CDN data into the format the frontend expects
-            home_team = g.get('homeTeam', {})
-            away_team = g.get('awayTeam', {})
-            
-            # Format the start time
-            start_time_str = g.get('gameEt', '1970-01-01T00:00:00Z')
+            unified = [_format_cdn_game(g) for g in data.get('games', [])]
             
-            unified.append({
-                "gameId": g.get('gameId'), # This is the nba_api compatible ID
-                "gameStatus": g.get('gameStatusText'),
-                "homeTeamId": home_team.get('teamId'),
-                "awayTeamId": away_team.get('teamId'),
-                "homeTeam": home_team.get('teamCity') + " " + home_team.get('teamName'),
-                "awayTeam": away_team.get('teamCity') + " " + away_team.get('teamName'),
-                "homeAbbr": home_team.get('teamTricode'),
-                "awayAbbr": away_team.get('teamTricode'),
-                "homeLogo": f"https://cdn.nba.com/logos/nba/{home_team.get('teamId')}/global/L/logo.svg" if home_team.get('teamId') else "/static/logo.png",
-                "awayLogo": f"https://cdn.nba.com/logos/nba/{away_team.get('teamId')}/global/L/logo.svg" if away_team.get('teamId') else "/static/logo.png",
-                "homeScore": home_team.get('score'),
-                "awayScore": away_team.get('score'),
-                "startTimeUTC": start_time_str,
-                "arena": g.get('arena', {}).get('name', '')
-            })
-            
-        out = {"games": unified}
-        cache_set('scoreboard', out, ttl=15) # Cache for 15 seconds
+            return {"games": unified}
+
+        out = fetch_or_wait('scoreboard', fetch_scoreboard, ttl=15) # Cache for 15 seconds
         return jsonify(out)
-        
+
     except Exception as e:
         app.logger.exception("api_scoreboard failed; returning sample")
         sample = {
@@ -298,30 +551,43 @@ def api_scoreboard():
         cache_set('scoreboard', sample, ttl=15)
         return jsonify(sample)
 
+# ---------------------------
+# Shared league dashboard for all /api/leaders/* endpoints
+# ---------------------------
+def _leaders_df():
+    # One LeagueDashPlayerStats download (the slow part) feeds the homepage card and every
+    # per-stat leaderboard; callers slice it and must not modify it in place.
+    # Returns (df, col_by_lower): columns are deduplicated once here, and the lowercase name map
+    # (first column wins, like the old linear search) resolves stat columns without rescanning.
+    def fetch():
+        stats = _ep('leaguedashplayerstats').LeagueDashPlayerStats(per_mode_detailed='PerGame', season=CURRENT_SEASON, season_type_all_star='Regular Season', timeout=30)
+        df = stats.get_data_frames()[0]
+        if df.columns.has_duplicates:
+            df = df.loc[:, ~df.columns.duplicated()]
+        col_by_lower = {str(c).lower(): c for c in reversed(df.columns)}
+        return df, col_by_lower
+    return fetch_or_wait('leaders_df', fetch, ttl=300)
+
 # ---------------------------
 # API: /api/leaders/homepage
 # ---------------------------
 @app.route('/api/leaders/homepage')
 def api_leaders_home():
-    cached = cache_get('leaders_home')
-    if cached:
-        return jsonify(cached)
     try:
         if not NBA_API_AVAILABLE:
             raise RuntimeError("nba_api not available")
-        stats = leaguedashplayerstats.LeagueDashPlayerStats(per_mode_detailed='PerGame', season=CURRENT_SEASON, season_type_all_star='Regular Season', timeout=30)
-        df = stats.get_data_frames()[0]
-        teams_df = pd.DataFrame(teams_static.get_teams())
-        out = {}
-        for stat in ['PTS','REB','AST']:
-            col = stat if stat in df.columns else next((c for c in df.columns if c.lower()==stat.lower()), stat)
-            top5 = df.sort_values(by=col, ascending=False).head(5) if col in df.columns else df.head(5)
-            merged = pd.merge(top5, teams_df, left_on='TEAM_ID', right_on='id', how='left')
-            merged = merged.loc[:, ~merged.columns.duplicated()]
-            # FIX: Ensure PERSON_ID is included for frontend links
-            out[stat] = [{"PLAYER": r.get('PLAYER_NAME') or r.get('PLAYER'), "TEAM": r.get('abbreviation'), stat: r.get(stat), "PERSON_ID": r.get('PLAYER_ID')} for r in merged.to_dict(orient='records')]
-        cache_set('leaders_home', out, ttl=30)
-        return jsonify(out)
+        def fetch_leaders_home():
+            df, col_by_lower = _leaders_df()
+            teams_by_id = _teams_by_id()
+            out = {}
+            for stat in ['PTS','REB','AST']:
+                col = stat if stat in df.columns else col_by_lower.get(stat.lower(), stat)
+                top5 = df.nlargest(5, col) if col in df.columns else df.head(5)
+                # FIX: Ensure PERSON_ID is included for frontend links
+                out[stat] = [{"PLAYER": r.get('PLAYER_NAME') or r.get('PLAYER'), "TEAM": teams_by_id.get(r.get('TEAM_ID'), {}).get('abbreviation'), stat: r.get(stat), "PERSON_ID": r.get('PLAYER_ID')} for r in top5.to_dict(orient='records')]
+            return out
+        body, etag = fetch_or_wait('leaders_home', lambda: json_body(fetch_leaders_home()), ttl=30)
+        return etag_response(body, etag, max_age=30)
     except Exception as e:
         app.logger.exception("api_leaders_home failed; returning sample")
         sample = {
@@ -329,33 +595,40 @@ def api_leaders_home():
             "REB": [{"PLAYER":"N. Jokic","TEAM":"DEN","REB":11.2, "PERSON_ID": 203999},{"PLAYER":"G. Antetokounmpo","TEAM":"MIL","REB":10.8, "PERSON_ID": 203507}],
             "AST": [{"PLAYER":"L. Doncic","TEAM":"DAL","AST":9.8, "PERSON_ID": 1629029},{"PLAYER":"C. Paul","TEAM":"PHX","AST":8.9, "PERSON_ID": 101108}]
         }
-        cache_set('leaders_home', sample, ttl=30)
-        return jsonify(sample)
+        # Cached in the same (body, etag) shape the success path reads back under this key
+        body, etag = json_body(sample)
+        cache_set('leaders_home', (body, etag), ttl=30)
+        return etag_response(body, etag, max_age=30)
 
 # ---------------------------
 # API: /api/leaders/<stat_category>
 # ---------------------------
+LEADER_STATS = frozenset(['PTS','AST','REB','BLK','STL','FGM','FGA','FG3M','FG3A','FTM','FTA','FG_PCT','FG3_PCT','FT_PCT'])
+
 @app.route('/api/leaders/<stat_category>')
 def api_leaders_full(stat_category):
     stat = stat_category.upper()
-    allowed = ['PTS','AST','REB','BLK','STL','FGM','FGA','FG3M','FG3A','FTM','FTA','FG_PCT','FG3_PCT','FT_PCT']
-    if stat not in allowed:
+    if stat not in LEADER_STATS:
         return jsonify({"error":"invalid stat"}), 400
     try:
         if not NBA_API_AVAILABLE:
             raise RuntimeError("nba_api not available")
-        stats = leaguedashplayerstats.LeagueDashPlayerStats(per_mode_detailed='PerGame', season=CURRENT_SEASON, season_type_all_star='Regular Season', timeout=30)
-        df = stats.get_data_frames()[0]
-        if stat not in df.columns:
-            match = next((c for c in df.columns if c.lower()==stat.lower()), None)
-            if match:
-                df = df.rename(columns={match: stat})
-        df_sorted = df.sort_values(by=stat, ascending=False).head(25) if stat in df.columns else df.head(25)
-        teams_df = pd.DataFrame(teams_static.get_teams()) if NBA_API_AVAILABLE else pd.DataFrame()
-        merged = pd.merge(df_sorted, teams_df, left_on='TEAM_ID', right_on='id', how='left') if not teams_df.empty else df_sorted
-        merged = merged.loc[:, ~merged.columns.duplicated()]
-        recs = safe_records_from_df(merged)
-        return jsonify(recs)
+        def fetch_leaders_full():
+            df, col_by_lower = _leaders_df()
+            col = stat if stat in df.columns else col_by_lower.get(stat.lower())
+            # Partial sort of the shared frame; only the 25 selected rows get renamed, never the full dashboard
+            df_sorted = df.nlargest(25, col) if col else df.head(25)
+            if col and col != stat:
+                df_sorted = df_sorted.rename(columns={col: stat})
+            recs = safe_records_from_df(df_sorted)
+            # Attach team metadata (abbreviation, full_name, ...) without a merge; player columns win on clashes
+            teams_by_id = _teams_by_id()
+            for r in recs:
+                for k, v in teams_by_id.get(r.get('TEAM_ID'), {}).items():
+                    r.setdefault(k, v)
+            return json_body(recs)
+        body, etag = fetch_or_wait(f'leaders:{stat}', fetch_leaders_full, ttl=30)
+        return etag_response(body, etag, max_age=30)
     except Exception as e:
         app.logger.exception("api_leaders_full failed; returning sample")
         sample = [
@@ -371,9 +644,9 @@ def api_leaders_full(stat_category):
 def api_team_roster(team_id):
     try:
         if NBA_API_AVAILABLE:
-            r = commonteamroster.CommonTeamRoster(team_id=team_id)
-            df = r.get_data_frames()[0]
-            recs = safe_records_from_df(df)
+            # Pure passthrough: take the rowset as list-of-dicts and skip the DataFrame round-trip
+            r = _ep('commonteamroster').CommonTeamRoster(team_id=team_id)
+            recs = r.get_normalized_dict().get('CommonTeamRoster', [])
             return jsonify(recs)
         else:
             raise RuntimeError("nba_api not available")
@@ -388,80 +661,140 @@ def api_team_roster(team_id):
 # ---------------------------
 # API: /api/team/<team_id>/schedule
 # ---------------------------
-# ---------------------------
-# API: /api/team/<team_id>/schedule
-# ---------------------------
+# --- *** FIX: Helper to parse game time, returns None on failure *** ---
+def _parse_game_time(g):
+    game_time_str = g.get('gameEt') # Get value, no default
+    if not game_time_str: # Check for None or ""
+        return None # Return None if no date
+    try:
+        return datetime.fromisoformat(game_time_str.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            # Fallback for other formats
+            return datetime.strptime(game_time_str, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+        except Exception:
+            return None # Return None if all parsing fails
+
+def _private_cache_dir():
+    # CACHE_DIR if it is a real directory owned by us and closed to other users, else None
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        st = os.lstat(CACHE_DIR)
+    except OSError as e:
+        app.logger.warning(f"Schedule cache dir unavailable: {e}")
+        return None
+    if not S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        app.logger.warning(f"Not using {CACHE_DIR} for the schedule cache: not a private directory owned by this user")
+        return None
+    return CACHE_DIR
+
+def _write_private(path, data):
+    # NamedTemporaryFile is created O_EXCL with mode 0600, so it can't be a planted symlink;
+    # os.replace then swaps it in atomically, so readers never see a half-written file.
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    with tempfile.NamedTemporaryFile(mode, dir=os.path.dirname(path), delete=False) as f:
+        f.write(data)
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.remove(f.name)
+        raise
+
+def _fetch_schedule_raw():
+    # Conditional GET against the on-disk copy: a 304 means the (multi-MB) body is reused from disk.
+    cache_dir = _private_cache_dir()
+    etag_file = SCHEDULE_CACHE_FILE + ".etag"
+    headers = {}
+    if cache_dir:
+        try:
+            with open(etag_file) as f:
+                if os.path.exists(SCHEDULE_CACHE_FILE):
+                    headers['If-None-Match'] = f.read().strip()
+        except OSError:
+            pass
+
+    app.logger.info("Fetching full schedule from NBA CDN...")
+    sched_url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json"
+    sched_res = _HTTP.get(sched_url, timeout=5, headers=headers)
+    if sched_res.status_code == 304:
+        app.logger.info("CDN schedule not modified; using %s", SCHEDULE_CACHE_FILE)
+        with open(SCHEDULE_CACHE_FILE, 'rb') as f:
+            return f.read()
+    sched_res.raise_for_status()
+
+    raw = sched_res.content
+    if not cache_dir:
+        return raw
+    try:
+        # Drop the old ETag first so a crash mid-update can never pair it with a different body
+        if os.path.exists(etag_file):
+            os.remove(etag_file)
+        _write_private(SCHEDULE_CACHE_FILE, raw)
+        etag = sched_res.headers.get('ETag')
+        if etag:
+            _write_private(etag_file, etag)
+    except OSError as e:
+        app.logger.warning(f"Could not persist CDN schedule: {e}")
+    return raw
+
+def _fetch_schedule_by_team():
+    # Download the full league schedule and index it once: team id -> [(start time, game)],
+    # times parsed and games sorted by date (games with no time first), so each request is a dict lookup.
+    cdn_schedule = app.json.loads(_fetch_schedule_raw())
+
+    by_team = defaultdict(list)
+    league_schedule = cdn_schedule.get('leagueSchedule', {})
+    for game_date in league_schedule.get('gameDates', []):
+        for game in game_date.get('games', []):
+            game_time = _parse_game_time(game)
+            # teamId in CDN is an integer
+            home_id = game.get('homeTeam', {}).get('teamId')
+            away_id = game.get('awayTeam', {}).get('teamId')
+            by_team[home_id].append((game_time, game))
+            if away_id != home_id:
+                by_team[away_id].append((game_time, game))
+    no_time = datetime.min.replace(tzinfo=timezone.utc)
+    for games in by_team.values():
+        games.sort(key=lambda tg: tg[0] or no_time)
+    return dict(by_team)
+
 @app.route('/api/team/<int:team_id>/schedule')
 def api_team_schedule(team_id):
     """
     FIXED: Re-written to use *only* the reliable NBA CDN schedule feed.
     This avoids all flaky nba_api endpoints for schedules.
-    It fetches the one CDN file and filters it for past/upcoming games.
+    It fetches the one CDN file and indexes it by team for past/upcoming games.
     """
     try:
-        # Get full league schedule from CDN (cached for 1 hour)
-        cdn_schedule = cache_get('full_schedule_v2') # Use a new cache key
-        if not cdn_schedule:
-            app.logger.info("Fetching full schedule from NBA CDN...")
-            sched_url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json"
-            sched_res = requests.get(sched_url, timeout=5)
-            sched_res.raise_for_status()
-            cdn_schedule = sched_res.json()
-            cache_set('full_schedule_v2', cdn_schedule, ttl=3600)
-
-        # Find all games for this team
-        team_games = []
-        league_schedule = cdn_schedule.get('leagueSchedule', {})
-        for game_date in league_schedule.get('gameDates', []):
-            for game in game_date.get('games', []):
-                # teamId in CDN is an integer
-                if game.get('homeTeam', {}).get('teamId') == team_id or \
-                    game.get('awayTeam', {}).get('teamId') == team_id:
-                    team_games.append(game)
-        
-        if not team_games:
+        # Full league schedule from CDN, indexed by team (refreshed hourly in the background)
+        schedule_by_team = fetch_stale_while_revalidate('schedule_by_team', _fetch_schedule_by_team, ttl=3600, max_stale=6 * 3600)
+
+        # All games for this team, already sorted by date
+        timed_games = schedule_by_team.get(team_id, [])
+        if not timed_games:
             app.logger.warning(f"No games found in CDN schedule for team {team_id}.")
             return jsonify({"upcoming": [], "recent": []})
 
-        # --- *** FIX: Helper to parse game time, returns None on failure *** ---
-        def get_game_time(g):
-            game_time_str = g.get('gameEt') # Get value, no default
-            if not game_time_str: # Check for None or ""
-                return None # Return None if no date
-            try:
-                return datetime.fromisoformat(game_time_str.replace('Z', '+00:00'))
-            except ValueError:
-                try:
-                    # Fallback for other formats
-                    return datetime.strptime(game_time_str, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
-                except Exception:
-                    return None # Return None if all parsing fails
-
-        # Sort all games by date (games with no time will be first/last)
-        team_games.sort(key=lambda g: get_game_time(g) or datetime.min.replace(tzinfo=timezone.utc))
-        
         # Split into upcoming and recent
         upcoming_games_raw = []
         recent_games_raw = []
         today = datetime.now(timezone.utc)
 
-        for g in team_games:
-            game_time = get_game_time(g)
+        for game_time, g in timed_games:
             # Use game time if available, otherwise check game status
             if game_time and game_time > today and g.get('gameStatusText') != 'Final':
-                upcoming_games_raw.append(g)
+                upcoming_games_raw.append((game_time, g))
             elif g.get('gameStatusText') == 'Final':
-                recent_games_raw.append(g)
+                recent_games_raw.append((game_time, g))
             elif not game_time and g.get('gameStatusText') != 'Final':
                 # No time, not final -> Upcoming
-                upcoming_games_raw.append(g)
+                upcoming_games_raw.append((game_time, g))
 
         # Helper to format game for frontend
-        def format_game(g, is_recent=False):
+        def format_game(g, game_time_obj, is_recent=False):
             home = g['homeTeam']
             away = g['awayTeam']
             matchup_str = f"{away['teamTricode']} @ {home['teamTricode']}"
-            game_time_obj = get_game_time(g)
 
             game_data = {
                 "GAME_ID": g['gameId'],
@@ -482,9 +815,9 @@ def api_team_schedule(team_id):
             return game_data
 
         # Get last 5 recent, first 5 upcoming
-        recent_games = [format_game(g, is_recent=True) for g in recent_games_raw[-5:]]
+        recent_games = [format_game(g, t, is_recent=True) for t, g in recent_games_raw[-5:]]
         recent_games.reverse() # Show most recent first
-        upcoming_games = [format_game(g) for g in upcoming_games_raw[:5]]
+        upcoming_games = [format_game(g, t) for t, g in upcoming_games_raw[:5]]
 
         return jsonify({
             "upcoming": upcoming_games,
@@ -510,7 +843,7 @@ def api_team_schedule(team_id):
 def api_player_profile(player_id):
     try:
         if NBA_API_AVAILABLE:
-            info = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()
+            info = _ep('commonplayerinfo').CommonPlayerInfo(player_id=player_id).get_data_frames()
             if info and len(info) > 0:
                 df_info = info[0]
                 # Also get headline stats
@@ -518,10 +851,9 @@ def api_player_profile(player_id):
                     df_stats = info[1]
                     # Merge stats into info df
                     if not df_stats.empty:
-                        stats_row = df_stats.iloc[0]
-                        df_info['PTS'] = stats_row.get('PTS')
-                        df_info['REB'] = stats_row.get('REB')
-                        df_info['AST'] = stats_row.get('AST')
+                        # Scalar .iat reads; .iloc[0] would build a whole mixed-dtype row Series first
+                        for col in ('PTS', 'REB', 'AST'):
+                            df_info[col] = df_stats[col].iat[0] if col in df_stats.columns else None
                 
                 recs = safe_records_from_df(df_info)
                 return jsonify({"info": recs})
@@ -554,9 +886,8 @@ def api_player_profile(player_id):
 def api_player_gamelog(player_id):
     try:
         if NBA_API_AVAILABLE:
-            gl = playergamelog.PlayerGameLog(player_id=player_id, season=CURRENT_SEASON)
-            df = gl.get_data_frames()[0]
-            recs = safe_records_from_df(df)
+            gl = _ep('playergamelog').PlayerGameLog(player_id=player_id, season=CURRENT_SEASON)
+            recs = gl.get_normalized_dict().get('PlayerGameLog', [])
             return jsonify(recs)
         else:
             raise RuntimeError("nba_api not available")
@@ -574,68 +905,153 @@ def api_player_gamelog(player_id):
 # ---------------------------
 # *** NEW HELPER FUNCTIONS for CDN box score ***
 # ---------------------------
+# ISO-8601 duration used by the CDN for minutes played, e.g. "PT34M12.00S"
+_CDN_MINUTES_RE = re.compile(r'PT(?:(\d+)M)?(?:(\d+)\.?\d*S)?')
+
+HEADSHOT_URL_TEMPLATE = "https://cdn.nba.com/headshots/nba/latest/1040x760/{}.png"
+
 def _format_cdn_player(p, team_tricode):
     # Helper to format a player obj from CDN to what frontend expects
     stats = p.get('statistics', {})
+    g = stats.get # bound once; this runs for every player in every boxscore
     
     # --- FIX FOR MINUTES ---
-    minutes_str = stats.get('minutes', 'PT0M0S') # Get the raw string
+    minutes_str = g('minutes', 'PT0M0S') # Get the raw string
     min_formatted = '00:00' # Default
-    if minutes_str and 'PT' in minutes_str:
-        try:
-            # Use regex to find M (minutes) and S (seconds) values
-            match = re.match(r'PT(?:(\d+)M)?(?:(\d+)\.?\d*S)?', minutes_str)
-            if match:
-                mins = match.group(1) or '0'
-                secs = match.group(2) or '0'
-                # Format as MM:SS with leading zeros
-                min_formatted = f"{mins.zfill(2)}:{secs.zfill(2)}"
-        except Exception:
-            pass # If parsing fails, it will just show '00:00'
+    if minutes_str and minutes_str.startswith('PT'):
+        # Use regex to find M (minutes) and S (seconds) values
+        match = _CDN_MINUTES_RE.match(minutes_str)
+        if match:
+            mins = match.group(1) or '0'
+            secs = match.group(2) or '0'
+            # Format as MM:SS with leading zeros
+            min_formatted = f"{mins.zfill(2)}:{secs.zfill(2)}"
     # --- END FIX ---
 
+    person_id = p.get('personId')
     return {
-        "personId": p.get('personId'),
+        "personId": person_id,
         # --- FIX FOR NAME: Use 'name' field, which is the full name ---
         "playerName": p.get('name', p.get('firstName', '') + ' ' + p.get('lastName', '')),
         "teamTricode": team_tricode,
         "minutes": min_formatted, # Use the new formatted string
-        "points": stats.get('points'),
-        "reboundsTotal": stats.get('reboundsTotal'),
-        "assists": stats.get('assists'),
-        "steals": stats.get('steals'),
-        "blocks": stats.get('blocks'),
-        "fieldGoalsMade": stats.get('fieldGoalsMade'),
-        "fieldGoalsAttempted": stats.get('fieldGoalsAttempted'),
-        "threePointersMade": stats.get('threePointersMade'),
-        "threePointersAttempted": stats.get('threePointersAttempted'),
-        "freeThrowsMade": stats.get('freeThrowsMade'),
-        "freeThrowsAttempted": stats.get('freeThrowsAttempted'),
-        "turnovers": stats.get('turnovers'),
-        "plusMinusPoints": stats.get('plusMinusPoints'),
-        "playerImageUrl": f"https://cdn.nba.com/headshots/nba/latest/1040x760/{p.get('personId')}.png"
+        "points": g('points'),
+        "reboundsTotal": g('reboundsTotal'),
+        "assists": g('assists'),
+        "steals": g('steals'),
+        "blocks": g('blocks'),
+        "fieldGoalsMade": g('fieldGoalsMade'),
+        "fieldGoalsAttempted": g('fieldGoalsAttempted'),
+        "threePointersMade": g('threePointersMade'),
+        "threePointersAttempted": g('threePointersAttempted'),
+        "freeThrowsMade": g('freeThrowsMade'),
+        "freeThrowsAttempted": g('freeThrowsAttempted'),
+        "turnovers": g('turnovers'),
+        "plusMinusPoints": g('plusMinusPoints'),
+        "playerImageUrl": HEADSHOT_URL_TEMPLATE.format(person_id)
     }
 
 def _format_cdn_team(t):
     # Helper to format a team obj from CDN to what frontend expects
-    stats = t.get('statistics', {})
+    g = t.get('statistics', {}).get
     return {
         "teamTricode": t.get('teamTricode'),
         "teamName": t.get('teamName'),
-        "points": stats.get('points'),
-        "reboundsTotal": stats.get('reboundsTotal'),
-        "assists": stats.get('assists'),
-        "steals": stats.get('steals'),
-        "blocks": stats.get('blocks'),
-        "fieldGoalsMade": stats.get('fieldGoalsMade'),
-        "fieldGoalsAttempted": stats.get('fieldGoalsAttempted'),
-        "threePointersMade": stats.get('threePointersMade'),
-        "threePointersAttempted": stats.get('threePointersAttempted'),
-        "freeThrowsMade": stats.get('freeThrowsMade'),
-        "freeThrowsAttempted": stats.get('freeThrowsAttempted'),
-        "turnovers": stats.get('turnovers'),
+        "points": g('points'),
+        "reboundsTotal": g('reboundsTotal'),
+        "assists": g('assists'),
+        "steals": g('steals'),
+        "blocks": g('blocks'),
+        "fieldGoalsMade": g('fieldGoalsMade'),
+        "fieldGoalsAttempted": g('fieldGoalsAttempted'),
+        "threePointersMade": g('threePointersMade'),
+        "threePointersAttempted": g('threePointersAttempted'),
+        "freeThrowsMade": g('freeThrowsMade'),
+        "freeThrowsAttempted": g('freeThrowsAttempted'),
+        "turnovers": g('turnovers'),
     }
 
+def _played(p):
+    # Only players who actually played: active with a non-empty, non-zero minutes value
+    minutes = p.get('statistics', {}).get('minutes')
+    return p.get('status') == 'ACTIVE' and minutes and minutes != '00:00'
+
+# Static fallback boxscore; its serialized body is built once (see _sample_boxscore_body)
+SAMPLE_BOXSCORE = {
+    "playerStats": [
+        {
+            "personId": 201939,
+            "playerName": "Stephen Curry",
+            "teamTricode": "GSW",
+            "minutes": "36:12",
+            "points": 34,
+            "reboundsTotal": 5,
+            "assists": 8,
+            "steals": 2,
+            "blocks": 0,
+            "fieldGoalsMade": 12,
+            "fieldGoalsAttempted": 23,
+            "threePointersMade": 7,
+            "threePointersAttempted": 13,
+            "freeThrowsMade": 3,
+            "freeThrowsAttempted": 3,
+            "turnovers": 2,
+            "plusMinusPoints": 10,
+            "playerImageUrl": f"https://cdn.nba.com/headshots/nba/latest/1040x760/201939.png"
+        }
+    ],
+    "teamStats": [
+        {
+            "teamTricode": "GSW",
+            "teamName": "Golden State Warriors",
+            "points": 108,
+            "reboundsTotal": 44,
+            "assists": 25,
+            "steals": 6,
+            "blocks": 4,
+            "fieldGoalsMade": 39,
+            "fieldGoalsAttempted": 92,
+            "threePointersMade": 14,
+            "threePointersAttempted": 39,
+            "freeThrowsMade": 16,
+            "freeThrowsAttempted": 21,
+            "turnovers": 12
+        },
+        {
+            "teamTricode": "LAL",
+            "teamName": "Los Angeles Lakers",
+            "points": 112,
+            "reboundsTotal": 48,
+            "assists": 22,
+            "steals": 5,
+            "blocks": 6,
+            "fieldGoalsMade": 41,
+            "fieldGoalsAttempted": 90,
+            "threePointersMade": 10,
+            "threePointersAttempted": 30,
+            "freeThrowsMade": 20,
+            "freeThrowsAttempted": 26,
+            "turnovers": 14
+        }
+    ]
+}
+
+@functools.lru_cache(maxsize=1)
+def _sample_boxscore_body():
+    return json_body(SAMPLE_BOXSCORE)[0]
+
+@functools.lru_cache(maxsize=1)
+def _sample_boxscore_gzip():
+    # Compressed once at max level; the per-request cost for gzip-capable clients is zero
+    return gzip.compress(_sample_boxscore_body(), 9)
+
+@functools.lru_cache(maxsize=1)
+def _sample_boxscore_msgpack():
+    return msgpack.packb(SAMPLE_BOXSCORE)
+
+def _wants_msgpack():
+    return MSGPACK_AVAILABLE and request.args.get('format') == 'msgpack'
+
 # ---------------------------
 # API: /api/game/<game_id>/boxscore
 # ---------------------------
@@ -650,7 +1066,7 @@ def api_game_boxscore(game_id):
     try:
         # 1. Fetch data from CDN
         url = f"https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
-        res = requests.get(url, timeout=5)
+        res = _HTTP.get(url, timeout=5)
         res.raise_for_status() # Fail fast if game_id is bad
         
         data = res.json()
@@ -663,19 +1079,13 @@ def api_game_boxscore(game_id):
         home_team = game.get('homeTeam', {})
         away_team = game.get('awayTeam', {})
 
-        # 2. Process Player Stats
-        player_stats = []
-        
-        # Get Away Team Players
-        for p in away_team.get('players', []):
-            # Only add players who actually played
-            if p.get('status') == 'ACTIVE' and p.get('statistics', {}).get('minutes') and p.get('statistics', {}).get('minutes') != '00:00':
-                player_stats.append(_format_cdn_player(p, away_team.get('teamTricode')))
-        
-        # Get Home Team Players
-        for p in home_team.get('players', []):
-            if p.get('status') == 'ACTIVE' and p.get('statistics', {}).get('minutes') and p.get('statistics', {}).get('minutes') != '00:00':
-                player_stats.append(_format_cdn_player(p, home_team.get('teamTricode')))
+        # 2. Process Player Stats (away team first, then home)
+        player_stats = [
+            _format_cdn_player(p, team.get('teamTricode'))
+            for team in (away_team, home_team)
+            for p in team.get('players', [])
+            if _played(p)
+        ]
 
         # 3. Process Team Stats (Finals only, no duplicates)
         team_stats = []
@@ -684,105 +1094,169 @@ def api_game_boxscore(game_id):
         if home_team.get('statistics'):
             team_stats.append(_format_cdn_team(home_team))
         
-        return jsonify({"playerStats": player_stats, "teamStats": team_stats})
+        out = {"playerStats": player_stats, "teamStats": team_stats}
+        if _wants_msgpack():
+            return app.response_class(msgpack.packb(out), mimetype='application/msgpack')
+        return jsonify(out)
 
     except Exception as e:
         app.logger.exception("api_game_boxscore (CDN) failed; returning sample")
-        sample = {
-            "playerStats": [
-                {
-                    "personId": 201939,
-                    "playerName": "Stephen Curry",
-                    "teamTricode": "GSW",
-                    "minutes": "36:12",
-                    "points": 34,
-                    "reboundsTotal": 5,
-                    "assists": 8,
-                    "steals": 2,
-                    "blocks": 0,
-                    "fieldGoalsMade": 12,
-                    "fieldGoalsAttempted": 23,
-                    "threePointersMade": 7,
-                    "threePointersAttempted": 13,
-                    "freeThrowsMade": 3,
-                    "freeThrowsAttempted": 3,
-                    "turnovers": 2,
-                    "plusMinusPoints": 10,
-                    "playerImageUrl": f"https://cdn.nba.com/headshots/nba/latest/1040x760/201939.png"
-                }
-            ],
-            "teamStats": [
-                {
-                    "teamTricode": "GSW",
-                    "teamName": "Golden State Warriors",
-                    "points": 108,
-                    "reboundsTotal": 44,
-                    "assists": 25,
-                    "steals": 6,
-                    "blocks": 4,
-                    "fieldGoalsMade": 39,
-                    "fieldGoalsAttempted": 92,
-                    "threePointersMade": 14,
-                    "threePointersAttempted": 39,
-                    "freeThrowsMade": 16,
-                    "freeThrowsAttempted": 21,
-                    "turnovers": 12
-                },
-                {
-                    "teamTricode": "LAL",
-                    "teamName": "Los Angeles Lakers",
-                    "points": 112,
-                    "reboundsTotal": 48,
-                    "assists": 22,
-                    "steals": 5,
-                    "blocks": 6,
-                    "fieldGoalsMade": 41,
-                    "fieldGoalsAttempted": 90,
-                    "threePointersMade": 10,
-                    "threePointersAttempted": 30,
-                    "freeThrowsMade": 20,
-                    "freeThrowsAttempted": 26,
-                    "turnovers": 14
-                }
-            ]
-        }
-        return jsonify(sample)
+        if _wants_msgpack():
+            return app.response_class(_sample_boxscore_msgpack(), mimetype='application/msgpack')
+        if request.accept_encodings['gzip']:
+            resp = app.response_class(_sample_boxscore_gzip(), mimetype='application/json')
+            resp.headers['Content-Encoding'] = 'gzip' # flask-compress leaves pre-encoded bodies alone
+            resp.headers['Vary'] = 'Accept-Encoding'
+            return resp
+        return app.response_class(_sample_boxscore_body(), mimetype='application/json')
 # ---------------------------
 # API: player accolades (optional)
 # ---------------------------
+def _player_name(player_id):
+    # Display name via CommonPlayerInfo, cached for a day; concurrent misses for the same player share one call.
+    def fetch():
+        # Only the display name is needed, so read the raw rowset instead of building a DataFrame
+        rows = _ep('commonplayerinfo').CommonPlayerInfo(player_id=player_id).get_normalized_dict().get('CommonPlayerInfo', [])
+        return (rows[0].get('DISPLAY_FIRST_LAST') if rows else None) or '' # '' caches "no name" too
+    return fetch_or_wait(f'player_name:{player_id}', fetch, ttl=86400) or None
+
+NAME_LOOKUP_BUDGET = 0.05 # seconds a request waits on stats.nba.com for uncached player names
+MAX_PENDING_NAME_LOOKUPS = 32 # process-wide; past this, misses answer "warming" without queueing work
+MAX_NAME_LOOKUPS_PER_REQUEST = 5 # CommonPlayerInfo calls one request may start or join
+
+# Name warming gets its own small pool so a burst of unknown ids can't starve the schedule refresh
+# in _POOL. _NAME_LOOKUPS holds one future per player id while its lookup is queued or running.
+_NAME_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='gametrack-names')
+_NAME_LOOKUPS = {}
+_NAME_LOOKUPS_LOCK = threading.Lock()
+
+def _warm_player_name(player_id):
+    try:
+        return _player_name(player_id)
+    finally:
+        with _NAME_LOOKUPS_LOCK:
+            _NAME_LOOKUPS.pop(player_id, None)
+
+def _name_lookup_future(player_id):
+    # The running lookup for player_id, a newly queued one, or None when the pending cap is reached
+    with _NAME_LOOKUPS_LOCK:
+        future = _NAME_LOOKUPS.get(player_id)
+        if future is None and len(_NAME_LOOKUPS) < MAX_PENDING_NAME_LOOKUPS:
+            future = _NAME_LOOKUPS[player_id] = _NAME_POOL.submit(_warm_player_name, player_id)
+        return future
+
+def _player_names(player_ids, budget=NAME_LOOKUP_BUDGET, max_lookups=MAX_NAME_LOOKUPS_PER_REQUEST):
+    # {id: name or None} for the ids resolved within budget. Only ids missing from the static table
+    # and the name cache reach stats.nba.com, at most max_lookups of them per call; the rest are left
+    # out ("warming"). Slower lookups keep running in _NAME_POOL and land in the cache for next time.
+    names, futures = {}, {}
+    static_names = _player_names_by_id()
+    for pid in player_ids:
+        if pid in static_names:
+            names[pid] = static_names[pid]
+            continue
+        cached = cache_get(f'player_name:{pid}')
+        if cached is not None:
+            names[pid] = cached or None
+            continue
+        if len(futures) >= max_lookups:
+            continue
+        future = _name_lookup_future(pid)
+        if future is not None:
+            futures[future] = pid
+    if futures:
+        done, _ = wait(futures, timeout=budget)
+        for f in done:
+            try:
+                names[futures[f]] = f.result()
+            except Exception:
+                app.logger.warning(f"Player name lookup failed for {futures[f]}")
+    return names
+
+def _accolades_lookup(player_ids, index):
+    # {id: accolades} from a load_accolades_index() result: try by id then by name fallback via
+    # commonplayerinfo. None means the name lookup is still pending; callers must not let clients
+    # cache that answer.
+    _, by_id, by_name = index
+    misses = [pid for pid in player_ids if pid not in by_id]
+    names = _player_names(misses) if misses and NBA_API_AVAILABLE else {}
+    out = {}
+    for pid in player_ids:
+        if pid in by_id:
+            out[pid] = by_id[pid]
+        elif not NBA_API_AVAILABLE:
+            out[pid] = []
+        elif pid in names:
+            out[pid] = by_name.get(names[pid], []) if names[pid] else []
+        else:
+            out[pid] = None
+    return out
+
+# Expected failures (odd accolades file shapes, upstream errors) degrade to an empty list;
+# anything else is a bug and should surface as a 500 instead of being swallowed.
+ACCOLADES_LOOKUP_ERRORS = (KeyError, IndexError, AttributeError, TypeError, requests.RequestException)
+
 @app.route('/api/player/<int:player_id>/accolades')
 def api_player_accolades(player_id):
     try:
-        accolades = load_accolades()
-        # try by id then by name fallback via commonplayerinfo
-        if str(player_id) in accolades:
-            return jsonify({"accolades": accolades[str(player_id)]})
-        if NBA_API_AVAILABLE:
-            p = commonplayerinfo.CommonPlayerInfo(player_id=player_id).get_data_frames()[0]
-            name = p.get('DISPLAY_FIRST_LAST').iloc[0] if 'DISPLAY_FIRST_LAST' in p.columns else None
-            if name and name in accolades:
-                return jsonify({"accolades": accolades[name]})
-        return jsonify({"accolades": []})
-    except Exception:
+        # Cheapest paths first, served from pre-serialized bodies: accolades keyed by id, then a
+        # name from the static players table; only ids missing from both go through the general
+        # (possibly networked) lookup.
+        index = load_accolades_index()
+        bodies_by_id, bodies_by_name = accolades_bodies(index)
+        static_name = _player_names_by_id().get(player_id)
+        if player_id in bodies_by_id:
+            return etag_response(*bodies_by_id[player_id], max_age=86400)
+        if static_name:
+            body, etag = bodies_by_name.get(static_name) or _no_accolades_body()
+            return etag_response(body, etag, max_age=86400)
+        accolades = _accolades_lookup([player_id], index)[player_id]
+        if accolades is None:
+            return jsonify({"accolades": []}) # name lookup still warming; answer now, uncached
+        # Accolades change at most daily; let browsers/CDNs reuse the body and revalidate with a 304
+        return etag_response(*json_body({"accolades": accolades}), max_age=86400)
+    except ACCOLADES_LOOKUP_ERRORS:
+        app.logger.debug("accolades lookup failed for %s", player_id, exc_info=True)
         return jsonify({"accolades": []})
 
 # ---------------------------
-# Run server
+# API: /api/players/accolades?ids=1,2,3 (batch)
 # ---------------------------
-if __name__ == '__main__':
-    import sys
+MAX_ACCOLADES_BATCH = 100
 
-    # Default port:
-    port = 5000
+@app.route('/api/players/accolades')
+def api_players_accolades():
+    # One round trip for many players (e.g. a whole roster): {"<id>": [accolades...]}
+    ids = []
+    for part in request.args.get('ids', '').split(','):
+        part = part.strip()
+        if part.isdigit():
+            ids.append(int(part))
+    ids = list(dict.fromkeys(ids))[:MAX_ACCOLADES_BATCH]
+    try:
+        found = _accolades_lookup(ids, load_accolades_index())
+        out = {str(pid): accolades or [] for pid, accolades in found.items()}
+        if any(accolades is None for accolades in found.values()):
+            return jsonify(out) # some names still warming; answer now, uncached
+        return etag_response(*json_body(out), max_age=86400)
+    except ACCOLADES_LOOKUP_ERRORS:
+        app.logger.debug("batch accolades lookup failed", exc_info=True)
+        return jsonify({str(pid): [] for pid in ids})
 
-    # Allow override: python api.py --port 8000
-    if "--port" in sys.argv:
-        idx = sys.argv.index("--port")
-        if idx + 1 < len(sys.argv):
-            try:
-                port = int(sys.argv[idx + 1])
-            except ValueError:
-                app.logger.error(f"Invalid port: {sys.argv[idx + 1]}. Using default 5000.")
+# ---------------------------
+# Run server
+# ---------------------------
+if __name__ == '__main__':
+    import argparse
 
+    # Allow override: python api.py --port 8000 (or --port=8000)
+    parser = argparse.ArgumentParser(description="GameTrack dev server")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--debug', action='store_true', help="enable the debugger and reloader (or set FLASK_DEBUG=1)")
+    args = parser.parse_args()
 
-    app.run(host='127.0.0.1', port=port, debug=True)
\ No newline at end of file
+    # Dev server only. Debug mode (reloader + debugger) is opt-in via --debug or FLASK_DEBUG=1.
+    # For production run under a real WSGI server instead, e.g.:
+    #     gunicorn -w 4 -k gthread --threads 8 api:app
+    debug = args.debug or os.environ.get('FLASK_DEBUG') == '1'
+    app.run(host='127.0.0.1', port=args.port, debug=debug, use_reloader=debug, threaded=True)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+wsgi.py - GameTrack WSGI entry point for gevent workers only
+
+Run:
+    gunicorn -k gevent -w $(nproc) --worker-connections 200 wsgi:app
+
+Notes:
+ - Requires gevent (pip install gevent). The stdlib is monkey-patched before api.py imports
+   requests, so CDN/nba_api calls in one request no longer block the others.
+ - Do not load this module under sync/gthread workers: patching after worker threads have started
+   is unsupported and breaks locking. For threaded workers use api.py directly:
+       gunicorn -w 4 -k gthread --threads 8 api:app
+ - The response cache in api.py is per worker process; with several workers each keeps its own copy.
+"""
+from gevent import monkey
+monkey.patch_all()
+
+from api import app # noqa: E402  (must come after monkey-patching)